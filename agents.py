@@ -1,82 +1,340 @@
-from copy import deepcopy
-from heapq import heappush, heappop
-import time
-import argparse
-from typing import List
 from connect_four import State, Game, Player
-from copy import deepcopy
-from random import randint
+from minimax_core import njit, search_root
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import Value
+from random import choice, randint
+import os
 
-class MinimaxNode:
+
+@lru_cache(maxsize=None)
+def _static_order(num_cols: int):
+    """
+    Produces the columns of a num_cols-wide board ordered from the center outwards, with the
+    lower column first on ties. Center columns take part in more potential four-in-a-rows, so
+    searching them first tends to make alpha-beta's first child a tight bound.
+
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :return: The column numbers, center first
+    :rtype: Tuple[int, ...]
     """
-    One node in the Minimax search tree.
+    return tuple(sorted(range(num_cols), key=lambda col: (abs(col - num_cols // 2), col)))
+
+
+## Static move order for the standard 7-column board.
+STATIC_ORDER = _static_order(7)
+
+## Search bound standing in for infinity: comfortably larger than any terminal or heuristic
+## value (those are at most a few hundred), but a plain small int, so value comparisons stay
+## int-int instead of mixing in floats.
+INF = 32000
+
+## Transposition table. Positions reached by different move orders hash identically (see
+## State.hash), so their subtrees are searched once and reused. Entries map state.hash ->
+## (depth, value, flag, best_move), where value is from the perspective of the position's
+## player to move (the negamax convention; the hash encodes the turn, so the perspective is
+## unambiguous), flag records whether value is exact or only a bound left over from an
+## alpha/beta cutoff at that depth, and best_move is searched first when the position is
+## revisited (e.g. one iterative-deepening iteration later). Stored values still depend
+## on the searching player's role and heuristic, so each MinimaxPlayer keeps its own persistent
+## table (self.tt) and passes it down; this module-level table is the default for direct
+## minimax calls and for the parallel search's worker processes.
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+TT_MAX_ENTRIES = 1 << 20
+TT = {}
+
+## Cache of my_heuristic kernel results (from 'x's perspective) keyed by position hash. Leaf
+## positions recur across iterative-deepening iterations and transposed lines but are never
+## stored in the transposition table (depth-0 results are not stored), so this complements it
+## rather than duplicating it. MinimaxPlayer.play clears the cache between searches to bound
+## its memory. three_line_heur needs no such cache: State maintains its value incrementally.
+HEUR_CACHE = {}
+
+
+def _ordered_moves(state: State, tt_move=None):
+    """
+    Produces the legal moves of the given state in a good order for alpha-beta search: the
+    transposition table's best move first if one is known, then the remaining columns in the
+    precomputed center-first static order (STATIC_ORDER for the standard board). Legality is
+    read straight off the heights array, so there is no per-call sort and no get_legal_moves
+    board walk. Assumes the state is not terminal.
 
+    :param state: The state whose moves are to be ordered
+    :type state: State
+    :param tt_move: The best move recorded for this position by a previous search, if any
+    :type tt_move: int
+    :return: The legal moves, best guesses first
+    :rtype: List[int]
     """
-    def __init__(self, state: State):
-        """
-        Stores the node's state, (heuristic) value, and a dictionary of successor nodes,
-        where the keys are possible moves and the values are the successor nodes resulting from those moves
+    moves = [col for col in _static_order(state.num_cols) if state.heights[col] < state.num_rows]
+    if tt_move is not None and tt_move in moves:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    return moves
 
-        :param  state: The state associated with this node
-        :type state: State
-        """
-        self.state = state
-        self.value = 0
-        self.successors = {}
 
-    def __eq__(self, other):
-        """
-        Recursively compares two MinimaxNodes, producing true if all have the same heuristic value,
-        state, and successors. Used by the == operator.
+## Best exact root value found so far by any worker process during a parallel root search
+## (see MinimaxPlayer(parallel=True)). Workers open their alpha window just below it, so a
+## root move that cannot beat the current best fails low quickly, while a move that ties or
+## beats it still comes back with an exact value for the tie-break.
+_shared_alpha = None
 
-        :param  other: The other MinimaxNode
-        :type other: MinimaxNode
-        :return: True if the nodes are equal, False otherwise
-        :rtype: bool
-        """
-        return self.state == other.state and self.value == other.value and self.successors == other.successors
 
+def _init_worker(shared_alpha):
+    """
+    Process-pool initializer: gives the worker process access to the shared root alpha.
+
+    :param shared_alpha: The best-root-value-so-far shared by all workers
+    :type shared_alpha: multiprocessing.Value
+    """
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+    # Entries inherited from the parent process may come from another player's search;
+    # within this worker the table only ever serves one player, so it is safe from here on.
+    TT.clear()
 
 
-def minimax(node: MinimaxNode, depth: int, max_role: str, heuristic_fn):
+def _search_child(num_cols, num_rows, bb_x, bb_o, turn, move, depth, max_role, heuristic_fn):
     """
-    Performs minimax search from the given node out to a maximum depth, when heuristic evaluation is performed.
-    Generates a tree of MinimaxNodes rooted at node, with correct state, value, and successors attributes
+    Searches one root move in a worker process and produces its (move, value) pair. The
+    position crosses the process boundary as its two bitboards and the turn; the full State
+    is rebuilt here, the move is played on it, and the remaining depth is searched with the
+    ordinary minimax.
+
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :param num_rows: The number of rows (height) of the board
+    :type num_rows: int
+    :param bb_x: Bitboard of 'x' pieces before the move (State.bb_x)
+    :type bb_x: int
+    :param bb_o: Bitboard of 'o' pieces before the move (State.bb_o)
+    :type bb_o: int
+    :param turn: Whose turn it is before the move
+    :type turn: str (one of 'x' or 'o')
+    :param move: The root move (column number) to search
+    :type move: int
+    :param depth: The root search depth; the subtree under move is searched to depth - 1
+    :type depth: int
+    :param max_role: The maximizing player
+    :type max_role: str (one of 'x' or 'o')
+    :param heuristic_fn: The heuristic evaluation function to be used at the max search depth
+    :type heuristic_fn: Function (State str -> float), which consumes the state to be evaluated and
+    :                   the maximizing player's role (either 'x' or 'o')
+    :return: The move and its evaluation
+    :rtype: Tuple[int, int]
+    """
+    ## Workers persist across every move of every game, and the per-search clear in
+    ## MinimaxPlayer.play only runs in the serial branch, so bound the cache here instead.
+    HEUR_CACHE.clear()
+    col_stride = num_rows + 1
+    board = []
+    for i in range(num_cols):
+        column = []
+        for j in range(num_rows):
+            bit = 1 << (i * col_stride + j)
+            if bb_x & bit:
+                column.append('x')
+            elif bb_o & bit:
+                column.append('o')
+            else:
+                column.append('.')
+        board.append(column)
+    state = State(num_cols, num_rows, turn, board)
+    state.make_move(move)
+    alpha = -INF
+    if _shared_alpha is not None:
+        # One below the shared best, so a move that merely ties it still returns exactly
+        alpha = _shared_alpha.value - 1
+    # minimax evaluates for the player to move, which after the root move is max_role's
+    # opponent: the root window (alpha, INF) and the result both flip sign.
+    value = -minimax(state, depth - 1, max_role, heuristic_fn, -INF, -alpha)
+    if _shared_alpha is not None:
+        with _shared_alpha.get_lock():
+            if value > _shared_alpha.value:
+                _shared_alpha.value = value
+    return move, value
+
+
+def _best_move(scores):
+    """
+    Picks the highest-valued move from the given (move, value) pairs, breaking ties uniformly
+    at random.
+
+    :param scores: The (move, value) pairs, one per legal move
+    :type scores: List[Tuple[int, int]]
+    :return: A move whose value is the maximum
+    :rtype: int
+    """
+    best = max(value for move, value in scores)
+    return choice([move for move, value in scores if value == best])
+
 
-    :param node: The node that will be the root of this search
-    :type node: MinimaxNode
+
+def minimax(state: State, depth: int, max_role: str, heuristic_fn,
+            alpha=-INF, beta=INF, tt=TT):
+    """
+    Performs minimax search with alpha-beta pruning from the given state out to a maximum depth,
+    when heuristic evaluation is performed, and produces the state's evaluation FROM THE
+    PERSPECTIVE OF THE PLAYER TO MOVE: positive when the side to move stands well, negative
+    when it stands badly. This is the negamax form: since minimax(child) from the opponent's
+    perspective is just the negation of the child's value from ours, every node maximizes
+    -minimax(child) and the separate maximizing and minimizing branches collapse into one.
+    The traversal is iterative, over an explicit stack of small list frames, rather than
+    recursive: at depth 4-6 the search visits tens of thousands to millions of nodes per move,
+    and a Python function call per node (frame allocation, argument boxing) costs more than the
+    node itself. The whole search reuses the one given state: each move is played with make_move
+    before descending into the child and undone with unmake_move when its value comes back up.
+
+    :param state: The state to search from; restored to its original value before returning
+    :type state: State
     :param depth: The search depth. When depth is 0, perform a heuristic evaluation.
     :type depth: int
-    :param max_role: The maximizing player
+    :param max_role: The maximizing player; only used to orient the heuristic at the leaves
     :type max_role: str (one of 'x' or 'o')
     :param heuristic_fn: The heuristic evaluation function to be used at the max search depth
     :type heuristic_fn: Function (State str -> float), which consumes the state to be evaluated and
     :                   the maximizing player's role (either 'x' or 'o')
-    :return: The evaluation of the given node
+    :param alpha: The best value the player to move can guarantee so far
+    :type alpha: int
+    :param beta: The best value the opponent can guarantee so far
+    :type beta: int
+    :param tt: The transposition table to probe and store into
+    :type tt: dict
+    :return: The evaluation of the given state for the player to move in it
     :rtype: int
     """
-    ## Base case
-    if (depth == 0 or node.state.is_terminal):
-        node.value = heuristic_fn(node.state, max_role)
-        return node.value
+    ## Each frame on the stack is one interior node with a child search in flight, laid out as
+    ## [depth, alpha, beta, alpha_orig, beta_orig, moves, next_index, best_value, best_move],
+    ## everything in the perspective of that node's player to move. The original window
+    ## (alpha_orig, beta_orig) is kept so the node's final value can be classified as exact or
+    ## a bound when it is stored in the transposition table. `enter` holds the node about to
+    ## be expanded (the current state, which the move loop below has already advanced into);
+    ## `value` holds a finished subtree's evaluation on its way up to the frame that spawned
+    ## it, or None while descending.
+    stack = []
+    enter = (depth, alpha, beta)
+    value = None
+
+    while True:
+        if enter is not None:
+            depth, alpha, beta = enter
+            enter = None
+
+            ## Base case; the heuristic evaluates for max_role, so flip its sign when the
+            ## other player is to move.
+            if (depth == 0 or state.is_terminal):
+                value = heuristic_fn(state, max_role)
+                if state.turn != max_role:
+                    value = -value
+            else:
+                ## Transposition table probe: reuse a previous search of this position if it
+                ## went at least as deep. Exact values cut the node off directly; bound values
+                ## tighten the alpha/beta window. A shallower entry still supplies its best
+                ## move, which is searched first.
+                tt_move = None
+                entry = tt.get(state.hash)
+                if entry is not None:
+                    tt_move = entry[3]
+                    if entry[0] >= depth:
+                        flag = entry[2]
+                        if flag == TT_EXACT:
+                            value = entry[1]
+                        elif flag == TT_LOWER:
+                            alpha = max(alpha, entry[1])
+                        else:
+                            beta = min(beta, entry[1])
+                        if value is None and alpha >= beta:
+                            value = entry[1]
+                if value is None:
+                    stack.append([depth, alpha, beta, alpha, beta,
+                                  _ordered_moves(state, tt_move), 0, -INF, None])
+
+        if value is None:
+            ## Descend: play the top frame's next move and enter the child position. The
+            ## child's window is the parent's, negated and swapped into its perspective.
+            frame = stack[-1]
+            move = frame[5][frame[6]]
+            frame[6] += 1
+            state.make_move(move)
+            enter = (frame[0] - 1, -frame[2], -frame[1])
+            continue
+
+        ## A subtree has finished; negate its value into the parent's perspective and fold it
+        ## into the frame that spawned it (the given state's own value, once the stack is
+        ## empty).
+        if not stack:
+            return value
+        frame = stack[-1]
+        move = frame[5][frame[6] - 1]
+        state.unmake_move(move)
+        value = -value
+        if value > frame[7]:
+            frame[7] = value
+            frame[8] = move
+        if frame[7] > frame[1]:
+            frame[1] = frame[7]
+        if frame[1] >= frame[2] or frame[6] == len(frame[5]):
+            ## The node is complete (cutoff or out of moves): store it in the transposition
+            ## table (always-replace) and bubble its value up. A value outside the original
+            ## window is only a bound on the true minimax value, and is flagged as such for
+            ## future probes.
+            best_value = frame[7]
+            if best_value <= frame[3]:
+                flag = TT_UPPER
+            elif best_value >= frame[4]:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            if len(tt) >= TT_MAX_ENTRIES:
+                tt.clear()
+            tt[state.hash] = (frame[0], best_value, flag, frame[8])
+            stack.pop()
+            value = best_value
+        else:
+            value = None
 
-    ## Set node's successors
-    moves = node.state.get_legal_moves()
-    for move in moves:
-        state_cpy = deepcopy(node.state)
-        state_cpy.advance_state(move)
-        node.successors[move] = MinimaxNode(state_cpy)
 
-    if (node.state.turn == max_role): # Maximizing Player
-        node.value = float('-inf')
-        for child in node.successors.keys():
-            node.value = max(node.value, minimax(node.successors[child], depth - 1, max_role, heuristic_fn))
-        return node.value
-    else: # Minimizing Player
-        node.value = float('inf')
-        for child in node.successors.keys():
-            node.value = min(node.value, minimax(node.successors[child], depth - 1, max_role, heuristic_fn))
-        return node.value
+
+def minimax_root(state: State, depth: int, max_role: str, heuristic_fn, tt=TT):
+    """
+    Performs an iterative-deepening minimax search from the given state and produces the best
+    move for the maximizing player, chosen uniformly at random among the highest-valued moves.
+    Shallow iterations are cheap and their results order the deeper ones: root moves are
+    revisited best-first, and the transposition table's best-move slots carry each iteration's
+    results down into the subtrees, so alpha-beta sees its strongest moves early and cuts off
+    sooner. Each root move is searched with a full (-inf, inf) window so its value is exact,
+    which keeps the random tie-break meaningful; pruning happens inside each subtree.
+
+    :param state: The state to search from; restored to its original value before returning
+    :type state: State
+    :param depth: The search depth. When depth is 0, perform a heuristic evaluation.
+    :type depth: int
+    :param max_role: The maximizing player
+    :type max_role: str (one of 'x' or 'o')
+    :param heuristic_fn: The heuristic evaluation function to be used at the max search depth
+    :type heuristic_fn: Function (State str -> float), which consumes the state to be evaluated and
+    :                   the maximizing player's role (either 'x' or 'o')
+    :param tt: The transposition table to probe and store into; a table kept across searches
+    :          lets one move's results seed the next move's ordering
+    :type tt: dict
+    :return: The best move (a column number) for the maximizing player
+    :rtype: int
+    """
+    values = {}
+    moves = _ordered_moves(state)
+    for d in range(1, depth + 1):
+        for move in moves:
+            state.make_move(move)
+            ## minimax evaluates for the player to move in the child, so flip the sign back
+            ## into max_role's perspective when max_role is the one who just moved.
+            value = minimax(state, d - 1, max_role, heuristic_fn, tt=tt)
+            values[move] = -value if state.turn != max_role else value
+            state.unmake_move(move)
+        moves.sort(key=lambda m: values[m], reverse=True)
+    return _best_move(list(values.items()))
 
 
 
@@ -94,10 +352,6 @@ def three_line_heur(state: State, max_role: str):
     :return: The evaluation of the given state
     :rtype: int
     """
-    col_dirs = [1, 1, 0, -1]
-    row_dirs = [0, 1, 1, 1]
-    result = 0
-
     #If the state is terminal, give the true evaluation
     if state.is_terminal:
         if state.winner == '':
@@ -107,27 +361,13 @@ def three_line_heur(state: State, max_role: str):
         else:
             return -100
 
-    #If the state is not terminal, give the heuristic evaluation
-    i = 0
-    while i < state.num_cols:
-        j = 0
-        while j < state.num_rows:
-            if state.board[i][j] != '.':
-                piece = state.board[i][j]
-                dir = 0
-                while dir < len(col_dirs):
-                    farthest_pnt = [i + 2 * col_dirs[dir], j + 2 * row_dirs[dir]]
-                    if state.coords_legal(farthest_pnt[0], farthest_pnt[1]):
-                        if piece == state.board[i + col_dirs[dir]][j + row_dirs[dir]] and \
-                                piece == state.board[farthest_pnt[0]][farthest_pnt[1]]:
-                            if piece == max_role:
-                                result += 1
-                            else:
-                                result -= 1
-                    dir += 1
-            j += 1
-        i += 1
-    return result
+    #If the state is not terminal, give the heuristic evaluation. The state keeps its
+    #three-in-a-row score up to date move by move (see State.three_line_score), so there is
+    #no board scan here at all.
+    result = state.three_line_score
+    if max_role == 'x':
+        return result
+    return -result
 
 
 
@@ -159,6 +399,83 @@ def zero_heur(state: State, max_role: str):
 
 
 
+## Pattern scores for _my_heuristic_kernel, indexed at in_a_row * 3 + open_ends, where
+## in_a_row counts matching pieces within three cells ahead (0..3) and open_ends counts open
+## ends found (0..2). Encodes the old if/elif scoring tree -- connect-2 with space is 5,
+## connect-3 is 10 with space or 7 without, a lone piece open on both sides is 3 -- as one
+## byte load instead of a branch chain in the inner loop.
+_SCORE_TABLE = bytes((0, 0, 3,
+                      0, 5, 5,
+                      7, 10, 10,
+                      0, 0, 0))
+
+
+@njit(cache=True)
+def _my_heuristic_kernel(board, num_cols, num_rows):
+    """
+    Scores a flat byte board (0 empty, 1 'x', 2 'o', indexed at col * num_rows + row) from
+    'x's perspective: center-column pieces, connect-2s and connect-3s with open space all
+    contribute, positively for 'x' and negatively for 'o'. Pattern values come from the
+    precomputed _SCORE_TABLE; each player's score accumulates separately and the signs are
+    combined only at the end.
+    Pure integer loops with the bounds checks inlined, so Numba can compile it when available.
+
+    :param board: The flat board to scan (State.board_flat)
+    :type board: bytearray
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :param num_rows: The number of rows (height) of the board
+    :type num_rows: int
+    :return: The score for 'x' minus the score for 'o'
+    :rtype: int
+    """
+    result_x = 0
+    result_o = 0
+    center = num_cols // 2
+    for i in range(num_cols):
+        for j in range(num_rows):
+            piece = board[i * num_rows + j]
+            if piece == 0:
+                continue
+            # Centre column bonus
+            score = 2 if i == center else 0
+
+            for dc, dr in ((1, 0), (1, 1), (0, 1), (-1, 1)):
+                in_a_row = 0
+                open_ends = 0
+                for dist in range(1, 4):  # Check up to three spaces from the current piece
+                    next_col = i + dist * dc
+                    next_row = j + dist * dr
+                    if 0 <= next_col < num_cols and next_row < num_rows:
+                        cell = board[next_col * num_rows + next_row]
+                        if cell == piece:
+                            in_a_row += 1
+                        elif cell == 0:
+                            open_ends += 1
+                            break  # Stop at the first open space
+                        else:
+                            break  # Opponent's piece
+                    else:
+                        break  # Edge of board
+
+                # Check for open space on the opposite side
+                opposite_col = i - dc
+                opposite_row = j - dr
+                if 0 <= opposite_col < num_cols and 0 <= opposite_row < num_rows and \
+                        board[opposite_col * num_rows + opposite_row] == 0:
+                    open_ends += 1
+
+                # Scoring for connect-2s and connect-3s with space
+                score += _SCORE_TABLE[in_a_row * 3 + open_ends]
+
+            if piece == 1:
+                result_x += score
+            else:
+                result_o += score
+    return result_x - result_o
+
+
+
 def my_heuristic(state: State, max_role: str):
     """
     Performs a heuristic evaluation of the given state.
@@ -172,10 +489,6 @@ def my_heuristic(state: State, max_role: str):
     :return: The evaluation of the given state
     :rtype: int
     """
-    col_dirs = [1, 1, 0, -1]
-    row_dirs = [0, 1, 1, 1]
-    result = 0
-
     # If the state is terminal, give the true evaluation
     if state.is_terminal:
         if state.winner == '':
@@ -185,64 +498,15 @@ def my_heuristic(state: State, max_role: str):
         else:
             return -100
 
-    # If the state is not terminal, give the heuristic evaluation
-    for i in range(state.num_cols):
-        for j in range(state.num_rows):
-            if state.board[i][j] != '.':
-                piece = state.board[i][j]
-                # Centre column bonus
-                if i == state.num_cols // 2:
-                    if piece == max_role:
-                        result += 2
-                    else:
-                        result -= 2
-                
-                for dir in range(len(col_dirs)):
-                    in_a_row = 0
-                    open_ends = 0
-                    for dist in range(1, 4):  # Check up to three spaces from the current piece
-                        next_col = i + dist * col_dirs[dir]
-                        next_row = j + dist * row_dirs[dir]
-                        if state.coords_legal(next_col, next_row):
-                            if state.board[next_col][next_row] == piece:
-                                in_a_row += 1
-                            elif state.board[next_col][next_row] == '.':
-                                open_ends += 1
-                                break  # Stop at the first open space
-                            else:
-                                break  # Opponent's piece or edge of board
-                        else:
-                            break  # Edge of board
-
-                    # Check for open space on the opposite side
-                    opposite_col = i - col_dirs[dir]
-                    opposite_row = j - row_dirs[dir]
-                    if state.coords_legal(opposite_col, opposite_row) and state.board[opposite_col][opposite_row] == '.':
-                        open_ends += 1
-
-                    # Scoring for connect-2s and connect-3s with space
-                    if in_a_row == 1 and open_ends >= 1:  # Connect-2 with space
-                        if piece == max_role:
-                            result += 5
-                        else:
-                            result -= 5
-                    elif in_a_row == 2:
-                        if open_ends >= 1:  # Connect-3 with space
-                            if piece == max_role:
-                                result += 10
-                            else:
-                                result -= 10
-                        else:  # Simple 3 in a row without space
-                            if piece == max_role:
-                                result += 7
-                            else:
-                                result -= 7
-                    elif in_a_row == 0 and open_ends == 2:  # Single piece with space on both sides
-                        if piece == max_role:
-                            result += 3
-                        else:
-                            result -= 3
-    return result
+    # If the state is not terminal, give the heuristic evaluation. The cached value is from
+    # 'x's perspective, so it is shared by both roles and the sign is applied on the way out.
+    result = HEUR_CACHE.get(state.hash)
+    if result is None:
+        result = _my_heuristic_kernel(state.board_flat, state.num_cols, state.num_rows)
+        HEUR_CACHE[state.hash] = result
+    if max_role == 'x':
+        return result
+    return -result
 
 
 
@@ -275,7 +539,7 @@ class MinimaxPlayer(Player):
 
     """
 
-    def __init__(self, depth: int, heur, display=True):
+    def __init__(self, depth: int, heur, display=True, parallel=False):
         """
         Stores minimax parameters
 
@@ -286,19 +550,34 @@ class MinimaxPlayer(Player):
         :           the maximizing player's role (either 'x' or 'o')
         :param display: If true, print board every play
         :type display: bool
+        :param parallel: If true, search each root move in its own worker process. Worth it for
+        :                deep searches with slow heuristics; for shallow searches the process
+        :                overhead outweighs the win.
+        :type parallel: bool
         """
         self.role = ''
         self.depth = depth
         self.heur = heur
         self.display = display
+        self.parallel = parallel
+        self._executor = None
+        self._shared_alpha = None
+        # Persistent transposition table, kept across moves and whole games: positions recur
+        # from one round to the next, so earlier searches keep seeding move ordering and
+        # cutoffs. Dropped only if the player's role changes (see initialize).
+        self.tt = {}
 
     def initialize(self, role: str):
         """
-        This function is called once for each agent at the beginning of a game, before any moves are made
+        This function is called once for each agent at the beginning of a game, before any moves are made.
+        The transposition table survives from game to game, but its stored values depend on
+        which role this player maximizes for, so it is dropped if the role changes.
 
         :param role: The role of the player
         :type role: str (one of 'x' or 'o')
         """
+        if role != self.role:
+            self.tt.clear()
         self.role = role
 
     def play(self, state: State):
@@ -313,15 +592,30 @@ class MinimaxPlayer(Player):
         """
         if self.display:
             state.display()
-        root = MinimaxNode(state)
-        minimax(root, self.depth, self.role, self.heur)
-        best_moves = []
-        for move in root.successors.keys():
-            if len(best_moves) == 0 or root.successors[move].value > root.successors[best_moves[0]].value:
-                best_moves = [move]
-            elif root.successors[move].value == root.successors[best_moves[0]].value:
-                best_moves.append(move)
-        return best_moves[randint(0, len(best_moves)-1)]
+        # Root parallelization: the subtrees under the legal root moves are independent, so
+        # each is searched in its own worker process. Workers share only the best root value
+        # found so far, used to start their alpha windows (see _search_child).
+        if self.parallel:
+            if self._executor is None:
+                self._shared_alpha = Value('l', -INF)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=min(state.num_cols, os.cpu_count() or 1),
+                    initializer=_init_worker, initargs=(self._shared_alpha,))
+            self._shared_alpha.value = -INF
+            futures = [self._executor.submit(_search_child, state.num_cols, state.num_rows,
+                                             state.bb_x, state.bb_o, state.turn, move,
+                                             self.depth, self.role, self.heur)
+                       for move in state.get_legal_moves()]
+            return _best_move([future.result() for future in futures])
+        # Fast path: for the stock three-in-a-row heuristic on a standard board, the whole
+        # fixed-depth search runs inside minimax_core's bitboard kernel -- no State objects,
+        # no per-node Python allocation, and JIT-compiled when Numba is installed.
+        if self.heur is three_line_heur and state.num_cols == 7 and state.num_rows == 6:
+            scores = search_root(state.bb_x, state.bb_o, state.heights, self.depth,
+                                 self.role == 'x', state.turn == 'x')
+            return _best_move(scores)
+        HEUR_CACHE.clear()
+        return minimax_root(state, self.depth, self.role, self.heur, self.tt)
 
 
 
@@ -400,9 +694,23 @@ if __name__ == "__main__":
     # game.display()
     win_lst = []
     games = 5
+    # The players persist across all the games so their transposition tables carry over from
+    # one round to the next, and any JIT-compiled kernels only pay their compile cost once.
+    p1 = MinimaxPlayer(4, my_heuristic)
+    p2 = MinimaxPlayer(4, three_line_heur)
+    # p1 = MinimaxPlayer(5, my_heuristic)
+    # p2 = MinimaxPlayer(5, three_line_heur)
+    # Warm-up: one throwaway search apiece, off the clock, compiles the kernels and seeds the
+    # tables before the games proper.
+    warm_state = State(7, 6, 'x')
+    for role, player in (('x', p1), ('o', p2)):
+        player.initialize(role)
+        display = player.display
+        player.display = False
+        player.play(warm_state)
+        player.display = display
     for i in range(games):
-        game = Game(MinimaxPlayer(4, my_heuristic), MinimaxPlayer(4, three_line_heur))
-        # game = Game(MinimaxPlayer(5, my_heuristic), MinimaxPlayer(5, three_line_heur))
+        game = Game(p1, p2)
         winner = game.play_game()
         game.display()
         win_lst += winner
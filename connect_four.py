@@ -1,7 +1,88 @@
 from typing import List
 from abc import ABC, abstractmethod
 from copy import deepcopy
-from random import randint
+from functools import lru_cache
+from random import randint, Random
+
+
+# Random source for Zobrist keys. Seeded so that hashes are reproducible from run to run.
+_zobrist_rng = Random(0x2B7E151628AED2A6)
+
+
+@lru_cache(maxsize=None)
+def _zobrist_tables(num_cols: int, num_rows: int):
+    """
+    Produces the Zobrist keys for a board of the given size: a [col][row][piece] table of
+    64-bit keys (piece index 0 for 'x', 1 for 'o'), plus one extra key that is XORed into a
+    position's hash whenever it is 'o' to move. XOR-ing the key of every piece on the board
+    (and the turn key) gives a hash that can be maintained incrementally as moves are made
+    and unmade, and that agrees for identical positions reached by different move orders.
+
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :param num_rows: The number of rows (height) of the board
+    :type num_rows: int
+    :return: The piece key table and the turn key
+    :rtype: Tuple[List[List[List[int]]], int]
+    """
+    table = [[[_zobrist_rng.getrandbits(64) for piece in range(2)]
+              for row in range(num_rows)]
+             for col in range(num_cols)]
+    turn_key = _zobrist_rng.getrandbits(64)
+    return table, turn_key
+
+
+@lru_cache(maxsize=None)
+def three_windows(num_cols: int, num_rows: int):
+    """
+    Produces every three-in-a-row window of a board of the given size as one flat table of
+    board_flat indices (col * num_rows + row), three per window. Windows are enumerated by
+    start cell and direction exactly as the heuristics have always scanned them, but the
+    in-bounds test for each window is decided once here instead of once per cell per
+    direction at every evaluation. For the standard 7x6 board this is a fixed table of 98
+    windows. Assumes the board has at most 256 cells so indices fit in bytes.
+
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :param num_rows: The number of rows (height) of the board
+    :type num_rows: int
+    :return: The window table, 3 indices per window
+    :rtype: bytes
+    """
+    indices = []
+    for i in range(num_cols):
+        for j in range(num_rows):
+            for dc, dr in ((1, 0), (1, 1), (0, 1), (-1, 1)):
+                far_col = i + 2 * dc
+                far_row = j + 2 * dr
+                if 0 <= far_col < num_cols and 0 <= far_row < num_rows:
+                    indices += [i * num_rows + j,
+                                (i + dc) * num_rows + (j + dr),
+                                far_col * num_rows + far_row]
+    return bytes(indices)
+
+
+@lru_cache(maxsize=None)
+def windows_through(num_cols: int, num_rows: int):
+    """
+    Produces, for each cell of a board of the given size, the ids of the three-in-a-row
+    windows (positions in the three_windows table) that pass through that cell, indexed by
+    board_flat index. A cell lies on at most a dozen or so windows, so a move only has to
+    touch that many per-window counters instead of rescanning the whole board.
+
+    :param num_cols: The number of columns (width) of the board
+    :type num_cols: int
+    :param num_rows: The number of rows (height) of the board
+    :type num_rows: int
+    :return: The window ids passing through each cell
+    :rtype: Tuple[Tuple[int, ...], ...]
+    """
+    table = three_windows(num_cols, num_rows)
+    through = [[] for cell in range(num_cols * num_rows)]
+    for w in range(0, len(table), 3):
+        for k in range(3):
+            through[table[w + k]].append(w // 3)
+    return tuple(tuple(ids) for ids in through)
 
 
 class State:
@@ -41,9 +122,69 @@ class State:
         elif num_cols <= 0 or num_rows <= 0 or len(self.board) != num_cols or len(self.board[0]) != num_rows:
             print("Warning: Board was initialized with incorrect size.")
 
-        self.is_terminal = False
-        self.winner = self.four_in_a_row()
-        self.is_terminal = self.winner != '' or len(self.get_legal_moves()) == 0
+        # Bitboard mirror of the grid: one bit per cell at (col * stride + row), with one unused
+        # sentinel row per column so shift-based checks never wrap between columns. heights[col]
+        # is the row the next piece dropped into col will land in.
+        self._col_stride = num_rows + 1
+        self.bb_x = 0
+        self.bb_o = 0
+        self.heights = []
+        self._full_mask = 0
+        # Zobrist hash of the position, maintained incrementally by make_move/unmake_move.
+        # Search code uses it to recognize transpositions (identical positions reached by
+        # different move orders).
+        self._zobrist, self._zobrist_turn = _zobrist_tables(num_cols, num_rows)
+        self.hash = 0
+        # Flat byte mirror of the grid (0 empty, 1 'x', 2 'o') at index col * num_rows + row,
+        # for heuristic kernels that want tight integer loops with no string compares.
+        self.board_flat = bytearray(num_cols * num_rows)
+        col_mask = (1 << num_rows) - 1
+        for i in range(num_cols):
+            self._full_mask |= col_mask << (i * self._col_stride)
+            height = 0
+            while height < num_rows and self.board[i][height] != '.':
+                height += 1
+            self.heights.append(height)
+            for j in range(num_rows):
+                if self.board[i][j] == 'x':
+                    self.bb_x |= 1 << (i * self._col_stride + j)
+                    self.hash ^= self._zobrist[i][j][0]
+                    self.board_flat[i * num_rows + j] = 1
+                elif self.board[i][j] == 'o':
+                    self.bb_o |= 1 << (i * self._col_stride + j)
+                    self.hash ^= self._zobrist[i][j][1]
+                    self.board_flat[i * num_rows + j] = 2
+        if self.turn == 'o':
+            self.hash ^= self._zobrist_turn
+
+        # Incrementally-maintained three-in-a-row bookkeeping: per-window piece counts for
+        # each player, and a running score equal to the number of windows 'x' has completed
+        # minus the number 'o' has. A move updates only the windows through the placed cell,
+        # so the three-in-a-row heuristic is a single attribute read instead of a board scan.
+        windows = three_windows(num_cols, num_rows)
+        self._windows_through = windows_through(num_cols, num_rows)
+        self._window_x = bytearray(len(windows) // 3)
+        self._window_o = bytearray(len(windows) // 3)
+        self.three_line_score = 0
+        for w in range(len(self._window_x)):
+            for k in range(3):
+                piece = self.board_flat[windows[3 * w + k]]
+                if piece == 1:
+                    self._window_x[w] += 1
+                elif piece == 2:
+                    self._window_o[w] += 1
+            if self._window_x[w] == 3:
+                self.three_line_score += 1
+            elif self._window_o[w] == 3:
+                self.three_line_score -= 1
+
+        if State.has_four(self.bb_x, self._col_stride):
+            self.winner = 'x'
+        elif State.has_four(self.bb_o, self._col_stride):
+            self.winner = 'o'
+        else:
+            self.winner = ''
+        self.is_terminal = self.winner != '' or (self.bb_x | self.bb_o) == self._full_mask
 
 
     def __eq__(self, other):
@@ -58,6 +199,37 @@ class State:
         return self.board == other.board
 
 
+    @staticmethod
+    def has_four(bb: int, col_stride: int):
+        """
+        Produces True if the given bitboard contains a four-in-a-row in any direction.
+        In the col * col_stride + row layout, neighboring cells are 1 bit apart vertically,
+        col_stride horizontally, and col_stride +/- 1 along the two diagonals; the sentinel
+        row per column keeps the shifts from wrapping between columns. Each direction is
+        checked with two shift-and-ands, so the whole test is a handful of integer ops.
+
+        :param bb: One player's bitboard (State.bb_x or State.bb_o)
+        :type bb: int
+        :param col_stride: The number of bits per column (State._col_stride)
+        :type col_stride: int
+        :return: True if the bitboard has a four-in-a-row, False otherwise
+        :rtype: bool
+        """
+        m = bb & (bb >> 1)
+        if m & (m >> 2):
+            return True
+        m = bb & (bb >> col_stride)
+        if m & (m >> (2 * col_stride)):
+            return True
+        m = bb & (bb >> (col_stride + 1))
+        if m & (m >> (2 * (col_stride + 1))):
+            return True
+        m = bb & (bb >> (col_stride - 1))
+        if m & (m >> (2 * (col_stride - 1))):
+            return True
+        return False
+
+
     def coords_legal(self, col: int, row: int):
         """
         Produces True if the given row and column are in-bounds for this board (indexed from 0)
@@ -172,6 +344,83 @@ class State:
         return result
 
 
+    def make_move(self, move: int):
+        """
+        Plays the given move directly on this state, without copying it or checking legality.
+        Search code uses this together with unmake_move in place of deepcopy: play a move,
+        recurse, then undo it, reusing one mutable state for the whole tree.
+        Assumes the state is not terminal and the move is legal.
+
+        :param move: The column index to insert a piece into
+        :type move: int
+        :return: An undo token to pass to unmake_move (the column played)
+        :rtype: int
+        """
+        place_row = self.heights[move]
+        self.board[move][place_row] = self.turn
+        # Only the piece just placed can complete a four-in-a-row, so a bitboard check of the
+        # mover's pieces replaces the old full-board scan.
+        if self.turn == 'x':
+            self.bb_x |= 1 << (move * self._col_stride + place_row)
+            self.hash ^= self._zobrist[move][place_row][0]
+            self.board_flat[move * self.num_rows + place_row] = 1
+            for w in self._windows_through[move * self.num_rows + place_row]:
+                self._window_x[w] += 1
+                if self._window_x[w] == 3:
+                    self.three_line_score += 1
+            self.turn = 'o'
+            if State.has_four(self.bb_x, self._col_stride):
+                self.winner = 'x'
+        else:
+            self.bb_o |= 1 << (move * self._col_stride + place_row)
+            self.hash ^= self._zobrist[move][place_row][1]
+            self.board_flat[move * self.num_rows + place_row] = 2
+            for w in self._windows_through[move * self.num_rows + place_row]:
+                self._window_o[w] += 1
+                if self._window_o[w] == 3:
+                    self.three_line_score -= 1
+            self.turn = 'x'
+            if State.has_four(self.bb_o, self._col_stride):
+                self.winner = 'o'
+        self.hash ^= self._zobrist_turn
+        self.heights[move] = place_row + 1
+        self.is_terminal = self.winner != '' or (self.bb_x | self.bb_o) == self._full_mask
+        return move
+
+
+    def unmake_move(self, move: int):
+        """
+        Undoes a move previously played with make_move, restoring the state exactly.
+        Assumes the state before the move was made was not terminal.
+
+        :param move: The undo token produced by make_move (the column played)
+        :type move: int
+        """
+        place_row = self.heights[move] - 1
+        self.heights[move] = place_row
+        self.board[move][place_row] = '.'
+        self.board_flat[move * self.num_rows + place_row] = 0
+        if self.turn == 'x': # 'o' made the move being undone
+            self.bb_o &= ~(1 << (move * self._col_stride + place_row))
+            self.hash ^= self._zobrist[move][place_row][1]
+            for w in self._windows_through[move * self.num_rows + place_row]:
+                if self._window_o[w] == 3:
+                    self.three_line_score += 1
+                self._window_o[w] -= 1
+            self.turn = 'o'
+        else:
+            self.bb_x &= ~(1 << (move * self._col_stride + place_row))
+            self.hash ^= self._zobrist[move][place_row][0]
+            for w in self._windows_through[move * self.num_rows + place_row]:
+                if self._window_x[w] == 3:
+                    self.three_line_score -= 1
+                self._window_x[w] -= 1
+            self.turn = 'x'
+        self.hash ^= self._zobrist_turn
+        self.winner = ''
+        self.is_terminal = False
+
+
     def advance_state(self, move: int):
         """
         Updates the state by playing the given move. A piece is added to the board, and the turn alternates
@@ -184,14 +433,7 @@ class State:
         """
         result = False
         if not self.is_terminal and self.move_is_legal(move):
-            place_row = self.get_first_empty_row(move)
-            self.board[move][place_row] = self.turn
-            if self.turn == 'x':
-                self.turn = 'o'
-            else:
-                self.turn = 'x'
-            self.winner = self.four_in_a_row()
-            self.is_terminal = self.winner != '' or len(self.get_legal_moves()) == 0
+            self.make_move(move)
             result = True
         return result
 
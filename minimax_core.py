@@ -0,0 +1,202 @@
+"""
+Self-contained bitboard search core for the standard 7x6 Connect Four board.
+
+The entire alpha-beta recursion runs on two plain integers (one bitboard per piece color, one
+bit per cell at col * 7 + row, with a sentinel row per column so shifts never wrap between
+columns) plus a heights array. Move generation, make/unmake, win detection, and the
+three-in-a-row heuristic are all inlined as integer arithmetic: no State objects, no strings,
+and no per-node allocation. When Numba is installed the kernel is JIT-compiled; without it,
+everything still runs as plain Python.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional. Without it the kernels run as plain Python, which is still correct,
+    # just not JIT-compiled.
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+NUM_COLS = 7
+NUM_ROWS = 6
+COL_STRIDE = NUM_ROWS + 1
+
+# All playable bits set; a position is a draw when (bb_x | bb_o) reaches this.
+FULL_MASK = 0
+for _col in range(NUM_COLS):
+    FULL_MASK |= ((1 << NUM_ROWS) - 1) << (_col * COL_STRIDE)
+del _col
+
+# Center-first column order; center columns take part in more potential four-in-a-rows, so
+# searching them first tends to produce early alpha-beta cutoffs.
+ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+# Search bound standing in for infinity; small enough that bounds pack into 16 bits.
+_INF = 32000
+
+
+@njit(cache=True)
+def _has_four(bb):
+    """
+    Produces True if the given bitboard contains four-in-a-row in any direction.
+    In the col * 7 + row layout, neighboring cells are 1 bit apart vertically, 7 horizontally,
+    and 8 / 6 along the two diagonals; each check is two shift-and-ands.
+
+    :param bb: One player's bitboard
+    :type bb: int
+    :return: True if the bitboard has a four-in-a-row, False otherwise
+    :rtype: bool
+    """
+    m = bb & (bb >> 1)
+    if m & (m >> 2):
+        return True
+    m = bb & (bb >> 7)
+    if m & (m >> 14):
+        return True
+    m = bb & (bb >> 8)
+    if m & (m >> 16):
+        return True
+    m = bb & (bb >> 6)
+    if m & (m >> 12):
+        return True
+    return False
+
+
+@njit(cache=True)
+def _count_threes(bb):
+    """
+    Counts the three-in-a-row windows on the given bitboard, one per starting cell and
+    direction, matching what three_line_heur counts by scanning the grid.
+
+    :param bb: One player's bitboard
+    :type bb: int
+    :return: The number of three-in-a-row windows
+    :rtype: int
+    """
+    result = 0
+    for shift in (1, 7, 8, 6):
+        m = bb & (bb >> shift) & (bb >> (2 * shift))
+        while m:
+            m &= m - 1
+            result += 1
+    return result
+
+
+## No cache=True here: Numba cannot reload a self-recursive function from its on-disk cache
+## (the process segfaults on the run after the cache is written), so this kernel is compiled
+## fresh in each process. The warm-up search in agents' __main__ absorbs that cost.
+@njit
+def _alphabeta(bb_x, bb_o, heights, depth, alpha, beta, max_is_x, x_to_move):
+    """
+    Alpha-beta search over the bitboard position, with the three-in-a-row heuristic at the
+    depth limit. Bitboards are passed by value so there is nothing to unmake; only the heights
+    array is mutated and restored around each recursive call.
+
+    :param bb_x: Bitboard of 'x' pieces
+    :type bb_x: int
+    :param bb_o: Bitboard of 'o' pieces
+    :type bb_o: int
+    :param heights: Per-column piece counts; restored before returning
+    :type heights: bytearray
+    :param depth: The search depth. When depth is 0, perform a heuristic evaluation.
+    :type depth: int
+    :param alpha: The best value the maximizing player can guarantee so far
+    :type alpha: int
+    :param beta: The best value the minimizing player can guarantee so far
+    :type beta: int
+    :param max_is_x: True if 'x' is the maximizing player
+    :type max_is_x: bool
+    :param x_to_move: True if it is 'x' to move
+    :type x_to_move: bool
+    :return: The evaluation of the position from the maximizing player's perspective
+    :rtype: int
+    """
+    if _has_four(bb_x):
+        return 100 if max_is_x else -100
+    if _has_four(bb_o):
+        return -100 if max_is_x else 100
+    if (bb_x | bb_o) == FULL_MASK:
+        return 0
+    if depth == 0:
+        value = _count_threes(bb_x) - _count_threes(bb_o)
+        return value if max_is_x else -value
+
+    if x_to_move == max_is_x: # Maximizing Player
+        best_value = -_INF
+        for move in (3, 2, 4, 1, 5, 0, 6):
+            height = heights[move]
+            if height < 6:
+                bit = 1 << (move * 7 + height)
+                heights[move] = height + 1
+                if x_to_move:
+                    value = _alphabeta(bb_x | bit, bb_o, heights, depth - 1, alpha, beta, max_is_x, False)
+                else:
+                    value = _alphabeta(bb_x, bb_o | bit, heights, depth - 1, alpha, beta, max_is_x, True)
+                heights[move] = height
+                if value > best_value:
+                    best_value = value
+                if best_value > alpha:
+                    alpha = best_value
+                if alpha >= beta:
+                    break
+        return best_value
+    else: # Minimizing Player
+        best_value = _INF
+        for move in (3, 2, 4, 1, 5, 0, 6):
+            height = heights[move]
+            if height < 6:
+                bit = 1 << (move * 7 + height)
+                heights[move] = height + 1
+                if x_to_move:
+                    value = _alphabeta(bb_x | bit, bb_o, heights, depth - 1, alpha, beta, max_is_x, False)
+                else:
+                    value = _alphabeta(bb_x, bb_o | bit, heights, depth - 1, alpha, beta, max_is_x, True)
+                heights[move] = height
+                if value < best_value:
+                    best_value = value
+                if best_value < beta:
+                    beta = best_value
+                if alpha >= beta:
+                    break
+        return best_value
+
+
+def search_root(bb_x, bb_o, heights, depth, max_is_x, x_to_move):
+    """
+    Evaluates every legal move of the given non-terminal position out to the given depth and
+    produces the (move, value) pairs, with values from the maximizing player's perspective.
+    Each root move is searched with a full window so its value is exact, which lets callers
+    tie-break among equally good moves however they like.
+
+    :param bb_x: Bitboard of 'x' pieces
+    :type bb_x: int
+    :param bb_o: Bitboard of 'o' pieces
+    :type bb_o: int
+    :param heights: Per-column piece counts; not modified
+    :type heights: List[int]
+    :param depth: The search depth
+    :type depth: int
+    :param max_is_x: True if 'x' is the maximizing player
+    :type max_is_x: bool
+    :param x_to_move: True if it is 'x' to move
+    :type x_to_move: bool
+    :return: A list of (move, value) pairs, one per legal move
+    :rtype: List[Tuple[int, int]]
+    """
+    scores = []
+    heights = bytearray(heights)
+    for move in range(7):
+        height = heights[move]
+        if height < 6:
+            bit = 1 << (move * 7 + height)
+            heights[move] = height + 1
+            if x_to_move:
+                value = _alphabeta(bb_x | bit, bb_o, heights, depth - 1, -_INF, _INF, max_is_x, False)
+            else:
+                value = _alphabeta(bb_x, bb_o | bit, heights, depth - 1, -_INF, _INF, max_is_x, True)
+            heights[move] = height
+            scores.append((move, value))
+    return scores